@@ -8,50 +8,311 @@ import time
 import subprocess
 import argparse
 import shutil
+import stat
 import zipfile
 import tempfile
+import hashlib
+import sqlite3
 import traceback
-from urllib.parse import urlparse, unquote
+import threading
+import contextlib
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse, unquote, urlencode
 
-try:
-    from tqdm import tqdm  # type: ignore
-except Exception:
-    tqdm = None
-
-try:
-    import requests  # type: ignore
-except Exception:
-    requests = None
+# Optional and third-party modules are imported on first use (see the load_*
+# helpers) so --help and cache-only paths start without paying for them.
+# None means "not tried yet"; False means "tried and not installed".
+tqdm = None
+requests = None
+orjson = None
 
 
 API_BASE = "https://api.mod.io/v1"
 VERSION = "1.0.1"
 CONFIG_NAME = "config.json"
 USER_AGENT = "ModioDirect/1.1 (TheRootExec)"
-DOWNLOAD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "downloads")
-CACHE_PATH = os.path.join(DOWNLOAD_DIR, "mod_cache.json")
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DOWNLOAD_DIR = os.path.join(APP_DIR, "downloads")
+CACHE_PATH = os.path.join(DOWNLOAD_DIR, "mod_cache.sqlite")
+LEGACY_CACHE_PATH = os.path.join(DOWNLOAD_DIR, "mod_cache.json")
 DEBUG = False
+USE_CACHE = True
+DEFAULT_JOBS = 4
+MAX_JOBS = 16
+ADAPTIVE_WINDOW = 3.0
+# Throughput changes within this fraction are treated as noise.
+ADAPTIVE_NOISE = 0.05
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+LOOKUP_TTL = 24 * 3600
+SLUG_TTL = 7 * 24 * 3600
+MEMO_SIZE = 256
+try:
+    PARALLEL_THRESHOLD = int(os.environ.get("MODIODIRECT_PARALLEL_THRESHOLD", 256 * 1024 * 1024))
+except ValueError:
+    PARALLEL_THRESHOLD = 256 * 1024 * 1024
+PARALLEL_PARTS = 8
+DOWNLOAD_CHUNK_SIZE = 2 * 1024 * 1024
+EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+LOOKUP_WORKERS = 8
+API_CONCURRENCY = 5
+# Directory levels below each root that detect_mod_folders looks into.
+STORE_SCAN_DEPTH = 4
+MODIO_SCAN_DEPTH = 3
 GAMES_DB_PATHS = [
-    os.path.join(os.path.dirname(os.path.abspath(__file__)), "games.json"),
+    os.path.join(APP_DIR, "games.json"),
     os.path.join(DOWNLOAD_DIR, "games.json"),
     os.path.join(os.path.expanduser("~"), "Downloads", "games.json"),
 ]
+# Used with match(), which anchors at the start of the (stripped) input.
 URL_REGEX = re.compile(
-    r"^https?://(?:www\.)?mod\.io/g/([^/]+)/m/([^/?#]+)",
-    re.IGNORECASE,
+    r"https?://(?:www\.)?mod\.io/g/([^/]+)/m/([^/?#]+)",
+    re.IGNORECASE | re.ASCII,
 )
+NAME_STRIP_REGEX = re.compile(r"[^a-z0-9]+")
+BEPINEX_PLUGINS_REGEX = re.compile(r"[\\/]bepinex[\\/]plugins\Z", re.IGNORECASE | re.ASCII)
+MOD_DIR_REGEX = re.compile(r"(?:mods?|paks)\Z", re.IGNORECASE | re.ASCII)
+# Lookahead so overlapping keywords are all seen in one scan.
+ERROR_PATTERN = re.compile(r"(?=(401|403|unauthorized|oauth|private|404|not found|429|rate|network|timeout))")
+ERROR_CATEGORIES = {
+    "401": "auth",
+    "403": "auth",
+    "unauthorized": "auth",
+    "oauth": "auth",
+    "private": "auth",
+    "404": "not_found",
+    "not found": "not_found",
+    "429": "rate",
+    "rate": "rate",
+    "network": "network",
+    "timeout": "network",
+}
+ERROR_PRIORITY = ("auth", "not_found", "rate", "network")
+FRIENDLY_ERRORS = {
+    "auth": "Mod is private, inaccessible, or requires authentication.",
+    "not_found": "Mod or game not found.",
+    "rate": "Rate limited. Try again later.",
+    "network": "Network error occurred.",
+}
+URL_PREFIXES = (
+    "https://mod.io/g/",
+    "http://mod.io/g/",
+    "https://www.mod.io/g/",
+    "http://www.mod.io/g/",
+)
+URL_PREFIX_LEN = max(map(len, URL_PREFIXES))
+_SESSION = None
+try:
+    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+except Exception:
+    pass
+_CACHE_LOCK = threading.RLock()
+_PATH_LOCKS = {}
+_PATH_LOCKS_GUARD = threading.Lock()
+_DOWNLOAD_SLOTS = None
+_HTTP_CACHE = None
+_LOOKUP_POOL = None
+_LOOKUP_POOL_GUARD = threading.Lock()
+# Caps in-flight mod.io API calls across batch workers and lookup threads so
+# a big batch does not trip the rate limiter. File downloads are not counted.
+_API_SLOTS = threading.BoundedSemaphore(API_CONCURRENCY)
+# Per-thread message prefix and tqdm row, set for each batch entry so
+# parallel output can be traced back to its mod.
+_OUTPUT = threading.local()
+_PRINT_LOCK = threading.Lock()
+
+
+class AtomicCounter:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def add(self, amount):
+        with self._lock:
+            self.value += amount
+
+
+# Bounds concurrent downloads. Each window the aggregate download rate is
+# compared with the previous one; the limit keeps stepping the same way while
+# the rate improves and reverses when it drops.
+class AdaptiveConcurrency:
+    def __init__(self, initial, minimum=1, maximum=MAX_JOBS, window=ADAPTIVE_WINDOW, counter=None):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.current = max(self.minimum, min(self.maximum, initial))
+        self.window = window
+        self.counter = counter if counter is not None else DOWNLOADED_BYTES
+        self.last_throughput = None
+        self.last_direction = -1 if self.current >= self.maximum else 1
+        self.active = 0
+        self._cond = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *_exc):
+        self.release()
+        return False
+
+    def acquire(self):
+        with self._cond:
+            while self.active >= self.current:
+                self._cond.wait()
+            self.active += 1
+
+    def release(self):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    def adjust(self, throughput):
+        with self._cond:
+            last = self.last_throughput
+            self.last_throughput = throughput
+            if last is not None:
+                change = (throughput - last) / last
+                if abs(change) <= ADAPTIVE_NOISE:
+                    # No clear gain or loss from the last step; stay put.
+                    return
+                if change < 0:
+                    self.last_direction = -self.last_direction
+            step = self.current + self.last_direction
+            self.current = max(self.minimum, min(self.maximum, step))
+            self._cond.notify_all()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="modiodirect-adaptive", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        last_bytes = self.counter.value
+        last_time = time.monotonic()
+        while not self._stopped.wait(self.window):
+            now = time.monotonic()
+            total = self.counter.value
+            elapsed = now - last_time
+            moved = total - last_bytes
+            last_bytes, last_time = total, now
+            # Idle windows (resolving, prompting) carry no signal.
+            if elapsed <= 0 or moved <= 0 or self.active == 0:
+                continue
+            self.adjust(moved / elapsed)
+
+
+DOWNLOADED_BYTES = AtomicCounter()
+
+
+def load_orjson():
+    global orjson
+    if orjson is None:
+        try:
+            import orjson as _orjson  # type: ignore
+            orjson = _orjson
+        except Exception:
+            orjson = False
+    return orjson or None
+
+
+def load_tqdm():
+    global tqdm
+    if tqdm is None:
+        try:
+            from tqdm import tqdm as _tqdm  # type: ignore
+            tqdm = _tqdm
+        except Exception:
+            tqdm = False
+    return tqdm or None
+
+
+def load_requests():
+    global requests
+    if requests is None:
+        try:
+            import requests as _requests  # type: ignore
+            requests = _requests
+        except Exception:
+            pass
+    return requests
+
+
+def json_loads(data):
+    fast = load_orjson()
+    if fast is not None:
+        return fast.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    fast = load_orjson()
+    if fast is not None:
+        return fast.dumps(obj, option=fast.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def write_file_atomic(path, data):
+    # Readers see either the old file or the complete new one, never a
+    # partial write.
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        cleanup_partial(tmp)
+        raise
+
+
+def output_prefix():
+    return getattr(_OUTPUT, "prefix", "")
+
+
+@contextlib.contextmanager
+def prefixed_output(prefix):
+    previous = output_prefix()
+    _OUTPUT.prefix = prefix
+    try:
+        yield
+    finally:
+        _OUTPUT.prefix = previous
+
+
+def run_prefixed(prefix, func, *args):
+    # Entry point for pool threads, which do not inherit the submitter's prefix.
+    with prefixed_output(prefix):
+        return func(*args)
+
+
+def write_line(line):
+    # print() writes the text and the newline separately, so lines from
+    # parallel workers could run together. tqdm.write also clears and redraws
+    # any active bars around the message.
+    with _PRINT_LOCK:
+        if tqdm:
+            tqdm.write(line)
+        elif sys.stdout is not None:
+            sys.stdout.write(line + "\n")
+            sys.stdout.flush()
 
 
 def print_error(msg):
-    print(f"[Error] {msg}")
+    write_line(f"[Error] {output_prefix()}{msg}")
 
 
 def print_info(msg):
-    print(f"[Info] {msg}")
+    write_line(f"[Info] {output_prefix()}{msg}")
 
 
 def print_status(msg):
-    print(f"[Status] {msg}")
+    write_line(f"[Status] {output_prefix()}{msg}")
 
 
 def cleanup_temp_file(path):
@@ -67,26 +328,183 @@ def cleanup_temp_file(path):
         pass
 
 
+def path_lock(path):
+    key = os.path.normcase(os.path.abspath(path))
+    with _PATH_LOCKS_GUARD:
+        lock = _PATH_LOCKS.get(key)
+        if lock is None:
+            lock = threading.Lock()
+            _PATH_LOCKS[key] = lock
+    return lock
+
+
+# The cache is a SQLite database in WAL mode so each entry is upserted on its
+# own instead of rewriting one big JSON file. A single connection is shared by
+# the worker threads and every access goes through _CACHE_LOCK.
 def load_cache():
     try:
-        if os.path.isfile(CACHE_PATH):
-            with open(CACHE_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            if isinstance(data, dict):
-                return data
+        fresh = not os.path.isfile(CACHE_PATH)
+        conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS mods(mod_id TEXT PRIMARY KEY, entry BLOB)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS http("
+            "key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB, ts REAL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS slugs("
+            "kind TEXT, key TEXT, id INTEGER, ts REAL, PRIMARY KEY(kind, key))"
+        )
+        conn.commit()
+    except Exception as exc:
+        print_info(f"Cache unavailable, continuing without it: {exc}")
+        return None
+    if fresh:
+        migrate_legacy_cache(conn)
+    return conn
+
+
+def migrate_legacy_cache(conn):
+    try:
+        if not os.path.isfile(LEGACY_CACHE_PATH):
+            return
+        with open(LEGACY_CACHE_PATH, "rb") as f:
+            data = json_loads(f.read())
+        if not isinstance(data, dict):
+            return
+        mods = data.get("mods")
+        if isinstance(mods, dict):
+            for mod_id, entry in mods.items():
+                if isinstance(entry, dict):
+                    put_cached_mod(conn, mod_id, entry)
+        http = data.get("http")
+        if isinstance(http, dict):
+            for key, entry in http.items():
+                if isinstance(entry, dict):
+                    put_cached_http(conn, key, entry)
     except Exception:
         pass
-    return {"mods": {}}
 
 
-def save_cache(cache):
+def get_cached_mod(cache, mod_id):
+    if cache is None or mod_id is None:
+        return None
+    with _CACHE_LOCK:
+        try:
+            row = cache.execute("SELECT entry FROM mods WHERE mod_id = ?", (str(mod_id),)).fetchone()
+        except Exception:
+            return None
+    if not row:
+        return None
     try:
-        os.makedirs(DOWNLOAD_DIR, exist_ok=True)
-        with open(CACHE_PATH, "w", encoding="utf-8") as f:
-            json.dump(cache, f, indent=2)
-        return True
+        entry = json_loads(row[0])
     except Exception:
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def put_cached_mod(cache, mod_id, entry):
+    if cache is None or mod_id is None:
         return False
+    with _CACHE_LOCK:
+        try:
+            cache.execute(
+                "INSERT OR REPLACE INTO mods(mod_id, entry) VALUES (?, ?)",
+                (str(mod_id), json_dumps(entry)),
+            )
+            cache.commit()
+            return True
+        except Exception:
+            return False
+
+
+def get_cached_http(cache, key):
+    with _CACHE_LOCK:
+        try:
+            row = cache.execute(
+                "SELECT etag, last_modified, body, ts FROM http WHERE key = ?", (key,)
+            ).fetchone()
+        except Exception:
+            return None
+    if not row:
+        return None
+    try:
+        body = json_loads(row[2])
+    except Exception:
+        return None
+    return {"etag": row[0], "last_modified": row[1], "body": body, "stored_at": row[3]}
+
+
+def put_cached_http(cache, key, entry):
+    with _CACHE_LOCK:
+        try:
+            cache.execute(
+                "INSERT OR REPLACE INTO http(key, etag, last_modified, body, ts) VALUES (?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.get("etag"),
+                    entry.get("last_modified"),
+                    json_dumps(entry.get("body")),
+                    entry.get("stored_at"),
+                ),
+            )
+            cache.commit()
+            return True
+        except Exception:
+            return False
+
+
+# Slug -> id mappings practically never change, so they are kept for a week
+# and skip the lookup request entirely. A 404 on the id drops the mapping.
+def get_cached_slug(cache, kind, key):
+    if cache is None:
+        return None
+    with _CACHE_LOCK:
+        try:
+            row = cache.execute(
+                "SELECT id, ts FROM slugs WHERE kind = ? AND key = ?", (kind, key.lower())
+            ).fetchone()
+        except Exception:
+            return None
+    if not row or not isinstance(row[0], int) or time.time() - (row[1] or 0) >= SLUG_TTL:
+        return None
+    return row[0]
+
+
+def put_cached_slug(cache, kind, key, value):
+    if cache is None:
+        return
+    with _CACHE_LOCK:
+        try:
+            cache.execute(
+                "INSERT OR REPLACE INTO slugs(kind, key, id, ts) VALUES (?, ?, ?, ?)",
+                (kind, key.lower(), value, time.time()),
+            )
+            cache.commit()
+        except Exception:
+            pass
+
+
+def drop_cached_slugs(cache, kind, value):
+    if cache is None:
+        return
+    with _CACHE_LOCK:
+        try:
+            cache.execute("DELETE FROM slugs WHERE kind = ? AND id = ?", (kind, value))
+            cache.commit()
+        except Exception:
+            pass
+
+
+def record_install(cache, mod_id, target):
+    if cache is None or mod_id is None:
+        return
+    with _CACHE_LOCK:
+        entry = get_cached_mod(cache, mod_id) or {}
+        entry["installed_version_id"] = entry.get("latest_version_id")
+        entry["installed_path"] = target
+        put_cached_mod(cache, mod_id, entry)
 
 
 def get_expected_size(file_obj):
@@ -103,18 +521,32 @@ def get_expected_size(file_obj):
     return None
 
 
+def get_expected_hash(file_obj):
+    filehash = file_obj.get("filehash") if isinstance(file_obj, dict) else None
+    if not isinstance(filehash, dict):
+        return None
+    for algorithm in ("sha256", "md5"):
+        value = filehash.get(algorithm)
+        if isinstance(value, str) and value.strip():
+            return algorithm, value.strip().lower()
+    return None
+
+
+def hash_file(path, algorithm):
+    hasher = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            hasher.update(block)
+    return hasher
+
+
 def friendly_error(err):
     if not isinstance(err, str):
         return "Unexpected error occurred."
-    s = err.lower()
-    if "401" in s or "403" in s or "unauthorized" in s or "oauth" in s or "private" in s:
-        return "Mod is private, inaccessible, or requires authentication."
-    if "404" in s or "not found" in s:
-        return "Mod or game not found."
-    if "429" in s or "rate" in s:
-        return "Rate limited. Try again later."
-    if "network" in s or "timeout" in s:
-        return "Network error occurred."
+    found = {ERROR_CATEGORIES[m.group(1)] for m in ERROR_PATTERN.finditer(err.lower())}
+    for category in ERROR_PRIORITY:
+        if category in found:
+            return FRIENDLY_ERRORS[category]
     return "Unexpected error occurred."
 
 
@@ -131,7 +563,7 @@ def print_banner():
 
 def try_auto_install_requests():
     global requests
-    if requests is not None:
+    if load_requests() is not None:
         return True
     print_error("The 'requests' library is required but not installed.")
     choice = input("Install requirements now? (y/n): ").strip().lower()
@@ -154,30 +586,150 @@ def try_auto_install_requests():
 
 def safe_json(resp):
     try:
-        return resp.json()
+        body = resp.content
+        # Empty bodies (304s, bare error statuses) skip the decode and the
+        # exception it would raise.
+        return json_loads(body) if body else None
     except Exception:
         return None
 
 
+def get_session():
+    global _SESSION
+    if _SESSION is not None:
+        return _SESSION
+    if load_requests() is None:
+        return None
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    try:
+        from requests.adapters import HTTPAdapter  # type: ignore
+        from urllib3.util.retry import Retry  # type: ignore
+
+        # Rate limits and server errors are retried here, honouring mod.io's
+        # Retry-After on 429/503; the final response is returned, not raised.
+        retry = Retry(
+            total=3,
+            backoff_factor=0.7,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=("GET", "HEAD"),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+        session.mount("https://", adapter)
+        # Download links can redirect to plain-HTTP mirrors; pool those too.
+        session.mount("http://", adapter)
+    except Exception:
+        pass
+    _SESSION = session
+    return _SESSION
+
+
 def safe_request(method, url, **kwargs):
-    if requests is None:
+    session = get_session()
+    if session is None:
         print_error("The 'requests' library is not installed. Install it with: pip install requests")
         return None
+    slots = _API_SLOTS if url.startswith(API_BASE) else contextlib.nullcontext()
     try:
-        return requests.request(method, url, **kwargs)
+        with slots:
+            return session.request(method, url, **kwargs)
     except Exception:
         print_error("Network error occurred.")
         return None
 
 
+def memoize_success(func):
+    # Like lru_cache, but failed lookups are not remembered so a transient
+    # network error does not stick for the rest of the session.
+    results = {}
+    lock = threading.Lock()
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        if not USE_CACHE:
+            return func(*args)
+        with lock:
+            if args in results:
+                return results[args]
+        value = func(*args)
+        if isinstance(value, tuple) and len(value) == 2 and value[1] is None:
+            with lock:
+                if len(results) >= MEMO_SIZE:
+                    results.pop(next(iter(results)))
+                results[args] = value
+        return value
+
+    def cache_clear():
+        with lock:
+            results.clear()
+
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+def http_cache_key(url, params):
+    items = sorted((k, str(v)) for k, v in (params or {}).items() if k != "api_key")
+    return f"{url}?{urlencode(items)}" if items else url
+
+
+def cached_get(url, params=None, timeout=15, ttl=None):
+    store = _HTTP_CACHE
+    key = http_cache_key(url, params)
+    entry = get_cached_http(store, key) if store is not None else None
+    if entry and ttl is not None:
+        stored_at = entry.get("stored_at")
+        if isinstance(stored_at, (int, float)) and time.time() - stored_at < ttl:
+            return 200, entry.get("body")
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    resp = safe_request("GET", url, params=params, headers=headers, timeout=timeout)
+    if resp is None:
+        return None, None
+    if resp.status_code == 304 and entry:
+        entry["stored_at"] = time.time()
+        put_cached_http(store, key, entry)
+        return 200, entry.get("body")
+    data = safe_json(resp)
+    if resp.status_code == 200 and store is not None and isinstance(data, dict):
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        # Empty lookups are not pinned for the TTL; the mod may appear later.
+        keep_for_ttl = ttl is not None and bool(data.get("data"))
+        if etag or last_modified or keep_for_ttl:
+            put_cached_http(store, key, {
+                "etag": etag,
+                "last_modified": last_modified,
+                "stored_at": time.time(),
+                "body": data,
+            })
+    return resp.status_code, data
+
+
+def check_api_response(status, data, ctx):
+    # Shared tail of every API lookup; callers handle their own 404 first.
+    if status is None:
+        return None, f"Network error while {ctx}."
+    if status == 401:
+        return None, "Invalid API key (401 Unauthorized)."
+    if status >= 400:
+        return None, f"API error ({status}) while {ctx}."
+    if not isinstance(data, dict):
+        return None, f"Empty or invalid API response while {ctx}."
+    return data, None
 
 
-def load_config(config_path):
-    if not os.path.isfile(config_path):
+def read_json_dict(path):
+    if not os.path.isfile(path):
         return {}
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = json_loads(f.read())
         if isinstance(data, dict):
             return data
     except Exception:
@@ -185,10 +737,13 @@ def load_config(config_path):
     return {}
 
 
+def load_config(config_path):
+    return read_json_dict(config_path)
+
+
 def save_config(config_path, data):
     try:
-        with open(config_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        write_file_atomic(config_path, json_dumps(data))
         return True
     except Exception as exc:
         print_error(f"Failed to save config: {exc}")
@@ -198,8 +753,7 @@ def save_config(config_path, data):
 def validate_api_key(api_key):
     url = f"{API_BASE}/games"
     params = {"api_key": api_key, "limit": 1}
-    headers = {"User-Agent": USER_AGENT}
-    resp = safe_request("GET", url, params=params, headers=headers, timeout=15)
+    resp = safe_request("GET", url, params=params, timeout=15)
     if resp is None:
         return False, "Network error or requests missing."
     if resp.status_code == 401:
@@ -246,6 +800,22 @@ def normalize_path_input(value):
     return value.strip().strip("\"").strip("'")
 
 
+def stdin_is_interactive():
+    try:
+        return sys.stdin is not None and sys.stdin.isatty()
+    except Exception:
+        return False
+
+
+def resolve_install_dir(install_dir):
+    # --install-dir replaces the folder menu, e.g. for unattended batch runs.
+    path = os.path.expanduser(normalize_path_input(install_dir))
+    if not path or not os.path.isdir(path):
+        print_error(f"Install folder not found: {install_dir}. Install skipped.")
+        return None
+    return path
+
+
 def prompt_mod_url():
     while True:
         raw = input("Enter mod URL (or file:PATH, q to exit, help): ").strip()
@@ -280,7 +850,7 @@ def prompt_mod_url():
         if not raw:
             print_error("URL cannot be empty.")
             continue
-        match = URL_REGEX.search(raw)
+        match = URL_REGEX.match(raw)
         if not match:
             print_error("Invalid mod.io URL. Expected: https://mod.io/g/<game_slug>/m/<mod_slug>")
             continue
@@ -311,117 +881,110 @@ def load_batch_urls(file_path):
 
 
 def parse_modio_url(url):
+    # Batch files can hold thousands of lines, so this avoids the regex and
+    # strips the known prefix instead. URL_REGEX stays for the prompt.
     if not isinstance(url, str):
         return None, None
-    raw = url.strip().split()[0]
-    match = URL_REGEX.search(raw)
-    if not match:
+    parts = url.split(None, 1)
+    if not parts:
+        return None, None
+    raw = parts[0]
+    head = raw[:URL_PREFIX_LEN].lower()
+    for prefix in URL_PREFIXES:
+        if head.startswith(prefix):
+            rest = raw[len(prefix):]
+            break
+    else:
         return None, None
-    game_slug = match.group(1).strip()
-    mod_slug = match.group(2).strip()
+    game_slug, _sep, tail = rest.partition("/")
+    if tail[:2].lower() != "m/":
+        return None, None
+    mod_slug = tail[2:]
+    for stop in "/?#":
+        mod_slug = mod_slug.split(stop, 1)[0]
+    game_slug = game_slug.strip()
+    mod_slug = mod_slug.strip()
     if not game_slug or not mod_slug:
         return None, None
     return game_slug, mod_slug
 
 
+@memoize_success
 def resolve_game_id(api_key, game_slug):
+    game_id = get_cached_slug(_HTTP_CACHE, "game", game_slug)
+    if game_id is not None:
+        return game_id, None
     url = f"{API_BASE}/games"
     params = {"api_key": api_key, "name_id": game_slug, "limit": 1}
-    headers = {"User-Agent": USER_AGENT}
-    resp = safe_request("GET", url, params=params, headers=headers, timeout=15)
-    if resp is None:
-        return None, "Network error while resolving game."
-    if resp.status_code == 401:
-        return None, "Invalid API key (401 Unauthorized)."
-    if resp.status_code == 429:
-        return None, "Rate limited (429) while resolving game."
-    if resp.status_code >= 400:
-        return None, f"API error ({resp.status_code}) while resolving game."
-    data = safe_json(resp)
-    if not isinstance(data, dict):
-        return None, "Empty or invalid API response while resolving game."
+    status, data = cached_get(url, params)
+    data, err = check_api_response(status, data, "resolving game")
+    if err:
+        return None, err
     items = data.get("data")
     if not isinstance(items, list) or len(items) == 0:
         fallback_id, fallback_err = fallback_search_game_id(api_key, game_slug)
         if fallback_id is not None:
+            put_cached_slug(_HTTP_CACHE, "game", game_slug, fallback_id)
             return fallback_id, None
         return None, fallback_err or "Game not found for provided game_slug."
-    game = items[0] if len(items) > 0 else None
+    game = items[0]
     if not isinstance(game, dict):
         return None, "Unexpected game data format."
     game_id = game.get("id")
     if not isinstance(game_id, int):
         return None, "Missing game_id in API response."
+    put_cached_slug(_HTTP_CACHE, "game", game_slug, game_id)
     return game_id, None
 
 
-def match_slug(item, slug):
+def match_slug(item, slug_lower):
+    # slug_lower is lowercased once by the caller, not once per search hit.
     if not isinstance(item, dict):
         return False
     name_id = item.get("name_id")
-    if isinstance(name_id, str) and name_id.lower() == slug.lower():
+    if isinstance(name_id, str) and name_id.lower() == slug_lower:
         return True
     alt_slug = item.get("slug")
-    if isinstance(alt_slug, str) and alt_slug.lower() == slug.lower():
-        return True
-    return False
+    return isinstance(alt_slug, str) and alt_slug.lower() == slug_lower
 
 
+@memoize_success
 def fallback_search_game_id(api_key, game_slug):
     url = f"{API_BASE}/games"
     params = {"api_key": api_key, "_q": game_slug, "limit": 100}
-    headers = {"User-Agent": USER_AGENT}
-    resp = safe_request("GET", url, params=params, headers=headers, timeout=15)
-    if resp is None:
-        return None, "Network error while searching game."
-    if resp.status_code == 401:
-        return None, "Invalid API key (401 Unauthorized)."
-    if resp.status_code == 429:
-        return None, "Rate limited (429) while searching game."
-    if resp.status_code >= 400:
-        return None, f"API error ({resp.status_code}) while searching game."
-    data = safe_json(resp)
-    if not isinstance(data, dict):
-        return None, "Empty or invalid API response while searching game."
+    status, data = cached_get(url, params, ttl=LOOKUP_TTL)
+    data, err = check_api_response(status, data, "searching game")
+    if err:
+        return None, err
     items = data.get("data")
     if not isinstance(items, list) or len(items) == 0:
         return None, "Game not found for provided game_slug."
+    slug_lower = game_slug.lower()
     for item in items:
-        if match_slug(item, game_slug):
+        if match_slug(item, slug_lower):
             game_id = item.get("id") if isinstance(item, dict) else None
             if isinstance(game_id, int):
                 return game_id, None
     return None, "Game not found for provided game_slug."
 
 
+@memoize_success
 def resolve_mod_id(api_key, game_id, mod_slug):
-    url = f"{API_BASE}/games/{game_id}/mods"
-    params = {"api_key": api_key, "name_id": mod_slug, "limit": 1}
-    headers = {"User-Agent": USER_AGENT}
-    resp = safe_request("GET", url, params=params, headers=headers, timeout=15)
-    if resp is None:
-        return None, "Network error while resolving mod."
-    if resp.status_code == 401:
-        return None, "Invalid API key (401 Unauthorized)."
-    if resp.status_code == 429:
-        return None, "Rate limited (429) while resolving mod."
-    if resp.status_code == 404:
-        fallback_id, fallback_err = resolve_mod_id_global(api_key, game_id, mod_slug)
-        if fallback_id is not None:
-            return fallback_id, None
-        return None, fallback_err or "API returned 404 while resolving mod. The game or mod may be inaccessible with this API key."
-    if resp.status_code >= 400:
-        return None, f"API error ({resp.status_code}) while resolving mod."
-    data = safe_json(resp)
-    if not isinstance(data, dict):
-        return None, "Empty or invalid API response while resolving mod."
+    key = f"{game_id}/{mod_slug}"
+    mod_id = get_cached_slug(_HTTP_CACHE, "mod", key)
+    if mod_id is not None:
+        return mod_id, None
+    mod_id, err = lookup_mod_id(api_key, game_id, mod_slug)
+    if mod_id is not None:
+        put_cached_slug(_HTTP_CACHE, "mod", key, mod_id)
+    return mod_id, err
+
+
+def first_listed_mod_id(data):
     items = data.get("data")
     if not isinstance(items, list) or len(items) == 0:
-        fallback_id, fallback_err = fallback_search_mod_id(api_key, game_id, mod_slug)
-        if fallback_id is not None:
-            return fallback_id, None
-        return None, fallback_err or "Mod not found for provided mod_slug."
-    mod = items[0] if len(items) > 0 else None
+        return None, None
+    mod = items[0]
     if not isinstance(mod, dict):
         return None, "Unexpected mod data format."
     mod_id = mod.get("id")
@@ -430,68 +993,73 @@ def resolve_mod_id(api_key, game_id, mod_slug):
     return mod_id, None
 
 
-def resolve_mod_id_global(api_key, game_id, mod_slug):
-    url = f"{API_BASE}/mods"
-    params = {"api_key": api_key, "game_id": game_id, "name_id": mod_slug, "limit": 1}
-    headers = {"User-Agent": USER_AGENT}
-    resp = safe_request("GET", url, params=params, headers=headers, timeout=15)
-    if resp is None:
-        return None, "Network error while resolving mod (global)."
-    if resp.status_code == 401:
-        return None, "Invalid API key (401 Unauthorized)."
-    if resp.status_code == 429:
-        return None, "Rate limited (429) while resolving mod (global)."
-    if resp.status_code == 404:
+def lookup_mod_id(api_key, game_id, mod_slug):
+    # The scoped, global and numeric lookups don't depend on each other, so
+    # they run together and the first valid id in that order wins. The _q
+    # searches only run once all of them have missed.
+    probes = [submit_lookup(resolve_mod_id_global, api_key, game_id, mod_slug)]
+    if mod_slug.isdigit():
+        probes.append(submit_lookup(resolve_mod_id_numeric, api_key, game_id, mod_slug))
+    url = f"{API_BASE}/games/{game_id}/mods"
+    params = {"api_key": api_key, "name_id": mod_slug, "limit": 1}
+    status, data = cached_get(url, params)
+    mod_id, err = None, None
+    if status != 404:
+        data, err = check_api_response(status, data, "resolving mod")
+        if err is None:
+            mod_id, err = first_listed_mod_id(data)
+    if mod_id is not None:
+        for probe in probes:
+            probe.cancel()
+        return mod_id, None
+    for probe in probes:
+        probe_id, _probe_err = probe.result()
+        if probe_id is not None:
+            return probe_id, None
+    if status == 404:
         search_id, search_err = resolve_mod_id_global_search(api_key, game_id, mod_slug)
         if search_id is not None:
             return search_id, None
-        numeric_id, numeric_err = resolve_mod_id_numeric(api_key, game_id, mod_slug)
-        if numeric_id is not None:
-            return numeric_id, None
-        return None, search_err or numeric_err or "API error (404) while resolving mod (global)."
-    if resp.status_code >= 400:
-        return None, f"API error ({resp.status_code}) while resolving mod (global)."
-    data = safe_json(resp)
-    if not isinstance(data, dict):
-        return None, "Empty or invalid API response while resolving mod (global)."
-    items = data.get("data")
-    if not isinstance(items, list) or len(items) == 0:
-        return None, "Mod not found for provided mod_slug."
-    mod = items[0] if len(items) > 0 else None
-    if not isinstance(mod, dict):
-        return None, "Unexpected mod data format."
-    mod_id = mod.get("id")
-    if not isinstance(mod_id, int):
-        return None, "Missing mod_id in API response."
+        return None, search_err or "API returned 404 while resolving mod. The game or mod may be inaccessible with this API key."
+    if err:
+        return None, err
+    fallback_id, fallback_err = fallback_search_mod_id(api_key, game_id, mod_slug)
+    if fallback_id is not None:
+        return fallback_id, None
+    return None, fallback_err or "Mod not found for provided mod_slug."
+
+
+def resolve_mod_id_global(api_key, game_id, mod_slug):
+    url = f"{API_BASE}/mods"
+    params = {"api_key": api_key, "game_id": game_id, "name_id": mod_slug, "limit": 1}
+    status, data = cached_get(url, params, ttl=LOOKUP_TTL)
+    data, err = check_api_response(status, data, "resolving mod (global)")
+    if err:
+        return None, err
+    mod_id, err = first_listed_mod_id(data)
+    if mod_id is None:
+        return None, err or "Mod not found for provided mod_slug."
     return mod_id, None
 
 
 def resolve_mod_id_global_search(api_key, game_id, mod_slug):
     url = f"{API_BASE}/mods"
     params = {"api_key": api_key, "_q": mod_slug, "limit": 100}
-    headers = {"User-Agent": USER_AGENT}
-    resp = safe_request("GET", url, params=params, headers=headers, timeout=15)
-    if resp is None:
-        return None, "Network error while searching mod (global)."
-    if resp.status_code == 401:
-        return None, "Invalid API key (401 Unauthorized)."
-    if resp.status_code == 429:
-        return None, "Rate limited (429) while searching mod (global)."
-    if resp.status_code >= 400:
-        return None, f"API error ({resp.status_code}) while searching mod (global)."
-    data = safe_json(resp)
-    if not isinstance(data, dict):
-        return None, "Empty or invalid API response while searching mod (global)."
+    status, data = cached_get(url, params, ttl=LOOKUP_TTL)
+    data, err = check_api_response(status, data, "searching mod (global)")
+    if err:
+        return None, err
     items = data.get("data")
     if not isinstance(items, list) or len(items) == 0:
         return None, "Mod not found for provided mod_slug."
+    slug_lower = mod_slug.lower()
     for item in items:
         if not isinstance(item, dict):
             continue
         item_game_id = item.get("game_id")
         if isinstance(item_game_id, int) and item_game_id != game_id:
             continue
-        if match_slug(item, mod_slug):
+        if match_slug(item, slug_lower):
             mod_id = item.get("id")
             if isinstance(mod_id, int):
                 return mod_id, None
@@ -504,19 +1072,10 @@ def resolve_mod_id_numeric(api_key, game_id, mod_slug):
     mod_id = int(mod_slug)
     url = f"{API_BASE}/games/{game_id}/mods/{mod_id}"
     params = {"api_key": api_key}
-    headers = {"User-Agent": USER_AGENT}
-    resp = safe_request("GET", url, params=params, headers=headers, timeout=15)
-    if resp is None:
-        return None, "Network error while resolving mod by numeric ID."
-    if resp.status_code == 401:
-        return None, "Invalid API key (401 Unauthorized)."
-    if resp.status_code == 429:
-        return None, "Rate limited (429) while resolving mod by numeric ID."
-    if resp.status_code >= 400:
-        return None, f"API error ({resp.status_code}) while resolving mod by numeric ID."
-    data = safe_json(resp)
-    if not isinstance(data, dict):
-        return None, "Empty or invalid API response while resolving mod by numeric ID."
+    status, data = cached_get(url, params)
+    data, err = check_api_response(status, data, "resolving mod by numeric ID")
+    if err:
+        return None, err
     mid = data.get("id")
     if not isinstance(mid, int):
         return None, "Missing mod_id in API response."
@@ -526,86 +1085,49 @@ def resolve_mod_id_numeric(api_key, game_id, mod_slug):
 def fallback_search_mod_id(api_key, game_id, mod_slug):
     url = f"{API_BASE}/games/{game_id}/mods"
     params = {"api_key": api_key, "_q": mod_slug, "limit": 100}
-    headers = {"User-Agent": USER_AGENT}
-    resp = safe_request("GET", url, params=params, headers=headers, timeout=15)
-    if resp is None:
-        return None, "Network error while searching mod."
-    if resp.status_code == 401:
-        return None, "Invalid API key (401 Unauthorized)."
-    if resp.status_code == 429:
-        return None, "Rate limited (429) while searching mod."
-    if resp.status_code >= 400:
-        return None, f"API error ({resp.status_code}) while searching mod."
-    data = safe_json(resp)
-    if not isinstance(data, dict):
-        return None, "Empty or invalid API response while searching mod."
+    status, data = cached_get(url, params, ttl=LOOKUP_TTL)
+    data, err = check_api_response(status, data, "searching mod")
+    if err:
+        return None, err
     items = data.get("data")
     if not isinstance(items, list) or len(items) == 0:
         return None, "Mod not found for provided mod_slug."
+    slug_lower = mod_slug.lower()
     for item in items:
-        if match_slug(item, mod_slug):
+        if match_slug(item, slug_lower):
             mod_id = item.get("id") if isinstance(item, dict) else None
             if isinstance(mod_id, int):
                 return mod_id, None
     return None, "Mod not found for provided mod_slug."
 
 
+@memoize_success
 def fetch_game_details(api_key, game_id):
     url = f"{API_BASE}/games/{game_id}"
     params = {"api_key": api_key}
-    headers = {"User-Agent": USER_AGENT}
-    resp = safe_request("GET", url, params=params, headers=headers, timeout=15)
-    if resp is None:
-        return None, "Network error while fetching game details."
-    if resp.status_code == 401:
-        return None, "Invalid API key (401 Unauthorized)."
-    if resp.status_code == 429:
-        return None, "Rate limited (429) while fetching game details."
-    if resp.status_code == 404:
+    status, data = cached_get(url, params)
+    if status == 404:
+        drop_cached_slugs(_HTTP_CACHE, "game", game_id)
         return None, "Game not accessible (404). The game may be private, unpublished, or require OAuth access."
-    if resp.status_code >= 400:
-        return None, f"API error ({resp.status_code}) while fetching game details."
-    data = safe_json(resp)
-    if not isinstance(data, dict):
-        return None, "Empty or invalid API response while fetching game details."
-    return data, None
+    return check_api_response(status, data, "fetching game details")
 
 
 def fetch_mod_details(api_key, game_id, mod_id):
     url = f"{API_BASE}/games/{game_id}/mods/{mod_id}"
     params = {"api_key": api_key}
-    headers = {"User-Agent": USER_AGENT}
-    resp = safe_request("GET", url, params=params, headers=headers, timeout=15)
-    if resp is None:
-        return None, "Network error while fetching mod details."
-    if resp.status_code == 401:
-        return None, "Invalid API key (401 Unauthorized)."
-    if resp.status_code == 429:
-        return None, "Rate limited (429) while fetching mod details."
-    if resp.status_code >= 400:
-        return None, f"API error ({resp.status_code}) while fetching mod details."
-    data = safe_json(resp)
-    if not isinstance(data, dict):
-        return None, "Empty or invalid API response while fetching mod details."
-    return data, None
+    status, data = cached_get(url, params)
+    if status == 404:
+        drop_cached_slugs(_HTTP_CACHE, "mod", mod_id)
+    return check_api_response(status, data, "fetching mod details")
 
 
 def fetch_mod_files(api_key, game_id, mod_id):
     url = f"{API_BASE}/games/{game_id}/mods/{mod_id}/files"
     params = {"api_key": api_key, "limit": 100}
-    headers = {"User-Agent": USER_AGENT}
-    resp = safe_request("GET", url, params=params, headers=headers, timeout=20)
-    if resp is None:
-        return None, "Network error while fetching mod files."
-    if resp.status_code == 401:
-        return None, "Invalid API key (401 Unauthorized)."
-    if resp.status_code == 429:
-        return None, "Rate limited (429) while fetching mod files."
-    if resp.status_code >= 400:
-        return None, f"API error ({resp.status_code}) while fetching mod files."
-    data = safe_json(resp)
-    if not isinstance(data, dict):
-        return None, "Empty or invalid API response while fetching mod files."
+    status, data = cached_get(url, params, timeout=20)
+    data, err = check_api_response(status, data, "fetching mod files")
+    if err:
+        return None, err
     items = data.get("data")
     if not isinstance(items, list) or len(items) == 0:
         return None, "No mod files found."
@@ -613,18 +1135,13 @@ def fetch_mod_files(api_key, game_id, mod_id):
 
 
 def select_latest_file(files):
-    if not isinstance(files, list) or len(files) == 0:
+    if not isinstance(files, list):
         return None
-    latest = None
-    latest_date = -1
-    for f in files:
-        if not isinstance(f, dict):
-            continue
-        date_added = f.get("date_added")
-        if isinstance(date_added, int) and date_added > latest_date:
-            latest_date = date_added
-            latest = f
-    return latest
+    return max(
+        (f for f in files if isinstance(f, dict) and isinstance(f.get("date_added"), int)),
+        key=lambda f: f["date_added"],
+        default=None,
+    )
 
 
 def extract_download_info(file_obj):
@@ -649,105 +1166,392 @@ def extract_download_info(file_obj):
     return binary_url, filename
 
 
-def download_file(url, filename, expected_size=None, allow_existing=True):
-    headers = {"User-Agent": USER_AGENT}
-    for attempt in range(1, 3):
-        try:
-            os.makedirs(DOWNLOAD_DIR, exist_ok=True)
-            if os.path.isabs(filename) or os.path.dirname(filename):
-                target = filename
-            else:
-                target = os.path.join(DOWNLOAD_DIR, filename)
-            if allow_existing and os.path.exists(target):
+def download_file(url, filename, expected_size=None, allow_existing=True, expected_hash=None):
+    if os.path.isabs(filename) or os.path.dirname(filename):
+        target = filename
+    else:
+        target = os.path.join(DOWNLOAD_DIR, filename)
+    # Batch workers may resolve to the same file name; one writer at a time.
+    with path_lock(target):
+        return download_to_target(
+            url,
+            target,
+            expected_size=expected_size,
+            allow_existing=allow_existing,
+            expected_hash=expected_hash,
+        )
+
+
+def download_to_target(url, target, expected_size=None, allow_existing=True, expected_hash=None):
+    part_path = target + ".part"
+    # The target only appears once a download completes, so this check does
+    # not need repeating per attempt.
+    try:
+        if allow_existing:
+            try:
+                st = os.stat(target)
+            except FileNotFoundError:
+                st = None
+            if st and (expected_size is None or st.st_size == expected_size):
                 print_info(f"File already exists, skipping: {target}")
                 print_info("Using existing file.")
                 return True, True, target
-            if os.path.exists(target):
-                try:
-                    os.remove(target)
-                except Exception:
-                    pass
+            if st:
+                print_info("Existing file is incomplete. Downloading again.")
+        try:
+            os.unlink(target)
+        except FileNotFoundError:
+            pass
+    except Exception as exc:
+        print_error(f"Failed to prepare download path: {exc}")
+        return False, False, ""
+    if not check_disk_space(url, target, expected_size):
+        return False, False, ""
+    for attempt in range(1, 3):
+        try:
+            try:
+                partial = os.path.getsize(part_path)
+            except FileNotFoundError:
+                partial = 0
+            if expected_size is not None and partial >= expected_size:
+                # Finished downloads are renamed right away, so this is stale.
+                os.remove(part_path)
+                partial = 0
         except Exception as exc:
             print_error(f"Failed to prepare download path: {exc}")
             return False, False, ""
 
-        print_status("Downloading...")
+        if partial == 0 and expected_size is not None and expected_size >= PARALLEL_THRESHOLD:
+            if probe_range_support(url) == expected_size:
+                print_status(f"Downloading in {PARALLEL_PARTS} parts...")
+                if parallel_download(url, part_path, expected_size):
+                    try:
+                        if expected_hash is None or hash_file(part_path, expected_hash[0]).hexdigest() == expected_hash[1]:
+                            os.replace(part_path, target)
+                            print_status("Download complete.")
+                            return True, False, target
+                        print_error("Downloaded file hash mismatch.")
+                    except Exception:
+                        pass
+                # Segments land out of order, so the file cannot be resumed.
+                cleanup_partial(part_path)
+                print_info("Parallel download failed. Falling back to a single stream.")
+
+        headers = {"Range": f"bytes={partial}-"} if partial else {}
+        print_status("Resuming download..." if partial else "Downloading...")
+        # Connection errors, 429 and 5xx were already retried by the session
+        # adapter; this loop only retries restarts and broken or bad bodies.
         resp = safe_request("GET", url, headers=headers, stream=True, timeout=30)
         if resp is None:
-            print_error("Network error occurred.")
-            if attempt == 2:
-                return False, False, ""
-            time.sleep(1)
-            continue
-        if resp.status_code == 429:
-            print_error("Rate limited. Try again later.")
-            if attempt == 2:
+            return False, False, ""
+        # Leaving the block releases the connection on every path, including
+        # the early continue/return branches and interrupted streams.
+        with resp:
+            if resp.status_code == 429:
+                print_error("Rate limited. Try again later.")
                 return False, False, ""
-            time.sleep(2)
-            continue
-        if resp.status_code >= 400:
-            print_error("Unexpected error occurred.")
-            if attempt == 2:
+            if resp.status_code == 416 and partial:
+                # Server cannot serve the remainder; start from scratch.
+                cleanup_partial(part_path)
+                continue
+            if resp.status_code >= 400:
+                print_error("Unexpected error occurred.")
                 return False, False, ""
-            time.sleep(1)
-            continue
+            if partial and resp.status_code != 206:
+                # Range was ignored and the full file is coming back.
+                partial = 0
+            if partial and not content_range_starts_at(resp, partial):
+                # Appending bytes from any other offset would corrupt the file.
+                cleanup_partial(part_path)
+                print_info("Server resumed from the wrong offset. Restarting download.")
+                continue
 
-        total = resp.headers.get("Content-Length")
-        try:
-            total_bytes = int(total) if total is not None else None
-        except Exception:
-            total_bytes = None
+            total = resp.headers.get("Content-Length")
+            try:
+                total_bytes = int(total) + partial if total is not None else None
+            except Exception:
+                total_bytes = None
 
-        try:
-            with open(target, "wb") as f:
-                if tqdm is not None and total_bytes is not None:
-                    with tqdm(total=total_bytes, unit="B", unit_scale=True, desc="Downloading") as bar:
-                        for chunk in resp.iter_content(chunk_size=1024 * 256):
+            try:
+                hasher = None
+                if expected_hash is not None:
+                    # Resumed bytes are hashed from disk first, then the stream.
+                    hasher = hash_file(part_path, expected_hash[0]) if partial else hashlib.new(expected_hash[0])
+                fd = open_raw(part_path, append=bool(partial))
+                written = 0
+                # Only fresh downloads of a known size; the stale-.part check above
+                # relies on expected_size to discard a preallocated leftover.
+                preallocated = (
+                    not partial
+                    and total_bytes is not None
+                    and total_bytes == expected_size
+                    and preallocate(fd, total_bytes)
+                )
+                try:
+                    with progress_bar(total_bytes, partial) as bar:
+                        # urllib3's readinto() is read() plus a copy, so reading into
+                        # a reused bytearray measured no faster than iter_content.
+                        for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
                             if not chunk:
                                 continue
-                            f.write(chunk)
+                            write_all(fd, chunk)
+                            if hasher is not None:
+                                hasher.update(chunk)
+                            written += len(chunk)
+                            DOWNLOADED_BYTES.add(len(chunk))
                             bar.update(len(chunk))
-                else:
-                    downloaded = 0
-                    last_print = 0
-                    for chunk in resp.iter_content(chunk_size=1024 * 256):
-                        if not chunk:
-                            continue
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_bytes:
-                            pct = int((downloaded / total_bytes) * 100)
-                            if pct >= last_print + 5 or pct == 100:
-                                print(f"Downloading... {pct}%")
-                                last_print = pct
-            if total_bytes is None:
-                print_info("Download complete (size unknown).")
-            if expected_size is not None:
-                try:
-                    actual = os.path.getsize(target)
-                    if actual != expected_size:
+                finally:
+                    if preallocated and written < total_bytes:
+                        # Shrink back so the size reflects real progress for resume.
                         try:
-                            os.remove(target)
+                            os.ftruncate(fd, written)
                         except Exception:
                             pass
-                        print_error("Downloaded file size mismatch. Retrying.")
-                        if attempt == 2:
-                            return False, False, ""
-                        time.sleep(1)
-                        continue
-                except Exception:
-                    pass
-            print_status("Download complete.")
-            return True, False, target
-        except Exception:
-            print_error("Unexpected error occurred.")
-            if attempt == 2:
-                return False, False, ""
-            time.sleep(1)
+                    os.close(fd)
+                actual = os.path.getsize(part_path)
+                if total_bytes is not None and actual < total_bytes:
+                    # Keep the partial file; the retry resumes from here.
+                    print_error("Download interrupted. Retrying.")
+                    if attempt == 2:
+                        return False, False, ""
+                    time.sleep(1)
+                    continue
+                if total_bytes is None:
+                    print_info("Download complete (size unknown).")
+                if expected_size is not None and actual != expected_size:
+                    cleanup_partial(part_path)
+                    print_error("Downloaded file size mismatch. Retrying.")
+                    if attempt == 2:
+                        return False, False, ""
+                    time.sleep(1)
+                    continue
+                if hasher is not None and hasher.hexdigest() != expected_hash[1]:
+                    cleanup_partial(part_path)
+                    print_error("Downloaded file hash mismatch. Retrying.")
+                    if attempt == 2:
+                        return False, False, ""
+                    time.sleep(1)
+                    continue
+                os.replace(part_path, target)
+                print_status("Download complete.")
+                return True, False, target
+            except Exception:
+                print_error("Unexpected error occurred.")
+                if attempt == 2:
+                    return False, False, ""
+                time.sleep(1)
     return False, False, ""
 
 
-def download_mod(url, filename=None, expected_size=None, allow_existing=True):
+def check_disk_space(url, target, expected_size=None):
+    # Fail before transferring anything rather than on ENOSPC halfway through
+    # a multi-GB file. The API size is used when known, otherwise one HEAD.
+    size = expected_size
+    if size is None:
+        resp = safe_request("HEAD", url, allow_redirects=True, timeout=15)
+        if resp is not None and resp.status_code < 400:
+            try:
+                size = int(resp.headers.get("Content-Length"))
+            except Exception:
+                size = None
+    if not size:
+        return True
+    try:
+        partial = os.path.getsize(target + ".part")
+    except OSError:
+        partial = 0
+    needed = max(0, size - partial) * 105 // 100
+    try:
+        free = shutil.disk_usage(os.path.dirname(target) or ".").free
+    except Exception:
+        return True
+    if free < needed:
+        print_error(
+            f"Not enough disk space: need {needed / (1024 * 1024):.0f} MB, "
+            f"{free / (1024 * 1024):.0f} MB free."
+        )
+        return False
+    return True
+
+
+def content_range_starts_at(resp, offset):
+    value = resp.headers.get("Content-Range", "")
+    unit, _sep, spec = value.strip().partition(" ")
+    if unit.lower() != "bytes":
+        return False
+    start = spec.partition("-")[0]
+    return start.isdigit() and int(start) == offset
+
+
+def open_raw(path, append=False):
+    # Unbuffered descriptor: chunks go straight to the OS without a second
+    # copy through BufferedWriter. O_BINARY matters on Windows.
+    flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    flags |= os.O_APPEND if append else os.O_TRUNC
+    return os.open(path, flags, 0o644)
+
+
+def preallocate(fd, size):
+    # Reserve the whole file up front so it lands in contiguous extents.
+    try:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(fd, 0, size)
+            return True
+        if os.name == "nt":
+            import ctypes
+            import msvcrt
+            from ctypes import wintypes
+
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetFilePointerEx.argtypes = [
+                wintypes.HANDLE,
+                ctypes.c_longlong,
+                ctypes.POINTER(ctypes.c_longlong),
+                wintypes.DWORD,
+            ]
+            kernel32.SetEndOfFile.argtypes = [wintypes.HANDLE]
+            handle = msvcrt.get_osfhandle(fd)
+            if not kernel32.SetFilePointerEx(handle, size, None, 0):
+                return False
+            ok = kernel32.SetEndOfFile(handle)
+            kernel32.SetFilePointerEx(handle, 0, None, 0)
+            return bool(ok)
+    except Exception:
+        pass
+    return False
+
+
+def write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+class TextProgress:
+    # Stand-in when tqdm is missing: prints every 5%, using integer byte
+    # thresholds so the per-chunk cost is one comparison.
+    def __init__(self, total, initial=0):
+        self.total = total
+        self.done = initial
+        # Captured here; range workers call update() from their own threads.
+        self.prefix = output_prefix()
+        self.step = max(1, total // 20) if total else 0
+        self.next_at = (initial // self.step + 1) * self.step if self.step else None
+
+    def update(self, amount):
+        self.done += amount
+        if self.next_at is not None and self.done >= self.next_at:
+            write_line(f"{self.prefix}Downloading... {min(100, self.done * 100 // self.total)}%")
+            self.next_at = (self.done // self.step + 1) * self.step
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+
+def progress_bar(total, initial=0):
+    bar_cls = load_tqdm()
+    if bar_cls is None:
+        return TextProgress(total, initial)
+    # Batch workers each draw on their own row instead of over each other.
+    position = getattr(_OUTPUT, "bar_position", None)
+    return bar_cls(
+        total=total,
+        initial=initial,
+        unit="B",
+        unit_scale=True,
+        desc=f"{output_prefix()}Downloading",
+        miniters=1,
+        mininterval=0.25,
+        position=position,
+        leave=position is None,
+    )
+
+
+def probe_range_support(url):
+    resp = safe_request("HEAD", url, allow_redirects=True, timeout=15)
+    if resp is not None and resp.status_code < 400 and resp.headers.get("Accept-Ranges", "").lower() == "bytes":
+        try:
+            return int(resp.headers.get("Content-Length"))
+        except Exception:
+            pass
+    # Some CDNs reject HEAD or leave out Accept-Ranges; a one-byte ranged GET
+    # answers the same question through Content-Range.
+    resp = safe_request("GET", url, headers={"Range": "bytes=0-0"}, stream=True, timeout=15)
+    if resp is None:
+        return None
+    with resp:
+        if resp.status_code != 206:
+            return None
+        total = resp.headers.get("Content-Range", "").rpartition("/")[2]
+        try:
+            return int(total)
+        except Exception:
+            return None
+
+
+def download_range(url, path, start, end, bar, bar_lock):
+    try:
+        resp = safe_request("GET", url, headers={"Range": f"bytes={start}-{end}"}, stream=True, timeout=30)
+        if resp is None:
+            return False
+        with resp:
+            if resp.status_code != 206:
+                return False
+            written = 0
+            # Each worker has its own descriptor, so seeks do not interfere.
+            fd = os.open(path, os.O_WRONLY | getattr(os, "O_BINARY", 0))
+            try:
+                os.lseek(fd, start, os.SEEK_SET)
+                for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if not chunk:
+                        continue
+                    write_all(fd, chunk)
+                    written += len(chunk)
+                    DOWNLOADED_BYTES.add(len(chunk))
+                    with bar_lock:
+                        bar.update(len(chunk))
+            finally:
+                os.close(fd)
+            return written == end - start + 1
+    except Exception:
+        return False
+
+
+def parallel_download(url, part_path, size, parts=PARALLEL_PARTS):
+    try:
+        fd = open_raw(part_path)
+        try:
+            if not preallocate(fd, size):
+                os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+    except Exception:
+        return False
+    step = -(-size // max(1, parts))
+    ranges = [(start, min(size, start + step) - 1) for start in range(0, size, step)]
+    bar_lock = threading.Lock()
+    with progress_bar(size) as bar:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as ex:
+            prefix = output_prefix()
+            results = list(ex.map(lambda r: run_prefixed(prefix, download_range, url, part_path, r[0], r[1], bar, bar_lock), ranges))
+    return all(results)
+
+
+def cleanup_partial(path):
+    try:
+        os.remove(path)
+    except Exception:
+        pass
+
+
+def download_mod(url, filename=None, expected_size=None, allow_existing=True, expected_hash=None):
     if not isinstance(url, str) or not url.strip():
         print_error("Download URL is invalid.")
         return None
@@ -761,26 +1565,51 @@ def download_mod(url, filename=None, expected_size=None, allow_existing=True):
             filename = None
     if not filename:
         filename = "modfile.bin"
-    ok, skipped, final_path = download_file(url, filename, expected_size=expected_size, allow_existing=allow_existing)
+    with _DOWNLOAD_SLOTS or contextlib.nullcontext():
+        ok, skipped, final_path = download_file(
+            url,
+            filename,
+            expected_size=expected_size,
+            allow_existing=allow_existing,
+            expected_hash=expected_hash,
+        )
     if not ok:
         return None, False
     return final_path, skipped
 
 
-def extract_mod(zip_path):
+def extract_mod(source, dest=None):
+    if isinstance(source, zipfile.ZipFile):
+        return extract_zip(source, dest)
+    zip_path = source
     if not isinstance(zip_path, str) or not zip_path:
         print_error("No downloaded file to extract.")
         return None
     if not os.path.exists(zip_path):
         print_error("Downloaded file does not exist.")
         return None
-    if not zipfile.is_zipfile(zip_path):
+    # Open once instead of is_zipfile() + ZipFile(), which both parse the
+    # central directory.
+    try:
+        zf = zipfile.ZipFile(zip_path, "r")
+    except zipfile.BadZipFile:
         print_error("Downloaded file is not a ZIP. Extraction skipped.")
         return None
+    except Exception:
+        print_error("Unexpected error occurred.")
+        return None
+    with zf:
+        return extract_zip(zf, dest)
+
+
+def extract_zip(zf, dest=None):
     try:
-        extract_path = tempfile.mkdtemp(prefix="modiodirect_extract_")
+        extract_path = dest or tempfile.mkdtemp(prefix="modiodirect_extract_")
         print_status("Extracting...")
-        with zipfile.ZipFile(zip_path, "r") as zf:
+        infos = zf.infolist()
+        if zf.filename and len(infos) > 1 and EXTRACT_WORKERS > 1:
+            extract_members(zf.filename, infos, extract_path)
+        else:
             zf.extractall(extract_path)
         print_status("Extraction complete.")
         return extract_path
@@ -789,10 +1618,38 @@ def extract_mod(zip_path):
         return None
 
 
+def extract_members(zip_path, infos, dest):
+    # ZipFile objects are not safe to share across threads, so each worker
+    # opens its own handle; inflate releases the GIL and scales across cores.
+    local = threading.local()
+    opened = []
+    opened_lock = threading.Lock()
+
+    def worker(info):
+        zf = getattr(local, "zf", None)
+        if zf is None:
+            zf = zipfile.ZipFile(zip_path, "r")
+            local.zf = zf
+            with opened_lock:
+                opened.append(zf)
+        try:
+            zf.extract(info, dest)
+        except FileExistsError:
+            # Another worker created a shared parent folder first.
+            zf.extract(info, dest)
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(EXTRACT_WORKERS, len(infos))) as ex:
+            list(ex.map(worker, infos))
+    finally:
+        for zf in opened:
+            zf.close()
+
+
 def normalize_name(value):
     if not isinstance(value, str):
         return ""
-    return re.sub(r"[^a-z0-9]+", "", value.lower())
+    return NAME_STRIP_REGEX.sub("", value.lower())
 
 
 def expand_path(value):
@@ -806,40 +1663,70 @@ def expand_path(value):
     return cleaned
 
 
+@functools.lru_cache(maxsize=8)
+def load_json_cached(path, mtime_ns, size):
+    with open(path, "rb") as f:
+        return json_loads(f.read())
+
+
+def file_signature(path):
+    # Parsed files are reused until their mtime or size changes, so a batch
+    # run reads games.json and globalsettings.json once instead of per URL.
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return path, st.st_mtime_ns, st.st_size
+
+
+def load_json_file(path):
+    sig = file_signature(path)
+    if sig is None:
+        return None
+    try:
+        return load_json_cached(*sig)
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=4)
+def load_games_db_cached(path, mtime_ns, size):
+    data = load_json_cached(path, mtime_ns, size)
+    if not isinstance(data, dict):
+        return None, {}
+    index = {}
+    games = data.get("game_mod_paths")
+    for item in games if isinstance(games, list) else []:
+        if not isinstance(item, dict):
+            continue
+        name = item.get("name")
+        if not isinstance(name, str):
+            continue
+        mod_paths = item.get("mod_folder_paths")
+        paths = [v for v in mod_paths.values() if isinstance(v, str)] if isinstance(mod_paths, dict) else []
+        index.setdefault(normalize_name(name), paths)
+    return data, index
+
+
 def load_games_db():
     for path in GAMES_DB_PATHS:
+        sig = file_signature(path)
+        if sig is None:
+            continue
         try:
-            if os.path.isfile(path):
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                if isinstance(data, dict):
-                    return data
+            data, index = load_games_db_cached(*sig)
         except Exception:
             continue
-    return None
+        if isinstance(data, dict):
+            return data, index
+    return None, {}
 
 
 def get_verified_paths_from_db(game_name):
-    data = load_games_db()
-    if not isinstance(data, dict):
-        return []
-    games = data.get("game_mod_paths")
-    if not isinstance(games, list):
-        return []
-    key = normalize_name(game_name)
-    for item in games:
-        if not isinstance(item, dict):
-            continue
-        name = item.get("name")
-        if isinstance(name, str) and normalize_name(name) == key:
-            paths = []
-            mod_paths = item.get("mod_folder_paths")
-            if isinstance(mod_paths, dict):
-                for _k, v in mod_paths.items():
-                    if isinstance(v, str):
-                        paths.append(v)
-            return paths
-    return []
+    _data, index = load_games_db()
+    return list(index.get(normalize_name(game_name), []))
 
 
 def get_modio_storage_roots():
@@ -850,103 +1737,125 @@ def get_modio_storage_roots():
     local_app = os.environ.get("LOCALAPPDATA", "")
     if local_app:
         settings = os.path.join(local_app, "mod.io", "globalsettings.json")
-        try:
-            if os.path.isfile(settings):
-                with open(settings, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                if isinstance(data, dict):
-                    root = data.get("RootLocalStoragePath")
-                    if isinstance(root, str) and os.path.isdir(root):
-                        roots.append(root)
-        except Exception:
-            pass
-    seen = set()
-    unique = []
+        data = load_json_file(settings)
+        if isinstance(data, dict):
+            root = data.get("RootLocalStoragePath")
+            if isinstance(root, str) and os.path.isdir(root):
+                roots.append(root)
+    unique = {}
     for r in roots:
-        key = r.lower()
-        if key in seen:
-            continue
-        seen.add(key)
-        unique.append(r)
-    return unique
+        unique.setdefault(os.path.normcase(r), r)
+    return list(unique.values())
+
+
+def iter_dirs(root, max_depth, depth=0):
+    # Yields (path, child directory names) top-down like os.walk, but only
+    # looks at directory entries and never follows symlinks.
+    try:
+        with os.scandir(root) as it:
+            subdirs = [entry for entry in it if entry.is_dir(follow_symlinks=False)]
+    except OSError:
+        return
+    yield root, [entry.name for entry in subdirs]
+    # Depth is carried down the recursion, so no relpath per directory.
+    if depth < max_depth:
+        for entry in subdirs:
+            yield from iter_dirs(entry.path, max_depth, depth + 1)
 
 
 def detect_mod_folders(game_name, game_id):
     if os.name != "nt":
         return []
+    # games.json often lists the same folder under several stores, so path
+    # expansion and isdir results are remembered for this call.
+    isdir = functools.lru_cache(maxsize=None)(os.path.isdir)
+    expand = functools.lru_cache(maxsize=None)(expand_path)
+    # Fast path: a verified games.json folder that exists ends detection here,
+    # before any store scan or mod.io settings lookup.
     verified = get_verified_paths_from_db(game_name)
-    verified_candidates = []
+    verified_candidates = {}
     for p in verified:
-        full = expand_path(p)
-        if full and os.path.isdir(full):
-            verified_candidates.append((f"{game_name} - Verified", full))
+        full = expand(p)
+        key = os.path.normcase(full)
+        if full and key not in verified_candidates and isdir(full):
+            verified_candidates[key] = (f"{game_name} - Verified", full)
     if verified_candidates:
-        return verified_candidates
+        return list(verified_candidates.values())
 
     roots = []
     steam_root = r"C:\Program Files (x86)\Steam\steamapps\common"
     epic_root = r"C:\Program Files\Epic Games"
-    if os.path.isdir(steam_root):
+    if isdir(steam_root):
         roots.append(steam_root)
-    if os.path.isdir(epic_root):
+    if isdir(epic_root):
         roots.append(epic_root)
 
     candidates = []
-    mod_dir_names = {"mods", "mod", "paks"}
     game_key = normalize_name(game_name)
-    for root in roots:
-        for base, dirs, _files in os.walk(root):
-            rel = os.path.relpath(base, root)
-            depth = rel.count(os.sep) if rel != "." else 0
-            if depth > 3:
-                dirs[:] = []
-                continue
+    name_keys = {}
 
-            lower_base = base.lower()
-            if lower_base.endswith(os.path.join("bepinex", "plugins")):
+    def matches_game(found_game):
+        if not game_key:
+            return True
+        key = name_keys.get(found_game)
+        if key is None:
+            key = normalize_name(found_game)
+            name_keys[found_game] = key
+        return key == game_key
+
+    for root in roots:
+        for base, dirs in iter_dirs(root, STORE_SCAN_DEPTH):
+            if BEPINEX_PLUGINS_REGEX.search(base):
                 found_game = os.path.basename(os.path.dirname(os.path.dirname(base)))
-                if game_key and normalize_name(found_game) != game_key:
+                if not matches_game(found_game):
                     continue
                 label = f"{found_game} - BepInEx/plugins"
                 candidates.append((label, base))
 
-            for d in list(dirs):
-                if d.lower() in mod_dir_names:
-                    full = os.path.join(base, d)
-                    found_game = os.path.basename(base)
-                    if game_key and normalize_name(found_game) != game_key:
-                        continue
-                    if os.path.isdir(full):
-                        label = f"{found_game} - {d}"
-                        candidates.append((label, full))
+            found_game = None
+            for d in dirs:
+                if MOD_DIR_REGEX.match(d):
+                    if found_game is None:
+                        found_game = os.path.basename(base)
+                        if not matches_game(found_game):
+                            break
+                    label = f"{found_game} - {d}"
+                    candidates.append((label, os.path.join(base, d)))
 
     if isinstance(game_id, int):
         gid = str(game_id)
         for root in get_modio_storage_roots():
             try:
-                for base, dirs, _files in os.walk(root):
-                    rel = os.path.relpath(base, root)
-                    depth = rel.count(os.sep) if rel != "." else 0
-                    if depth > 2:
-                        dirs[:] = []
-                        continue
-                    for d in list(dirs):
-                        if d == gid:
-                            path = os.path.join(base, d)
-                            if os.path.isdir(path):
-                                label = f"mod.io storage (game_id {gid})"
-                                candidates.append((label, path))
+                for base, dirs in iter_dirs(root, MODIO_SCAN_DEPTH):
+                    if gid in dirs:
+                        label = f"mod.io storage (game_id {gid})"
+                        candidates.append((label, os.path.join(base, gid)))
             except Exception:
                 continue
-    seen = set()
-    unique = []
+    # First label seen for a folder wins; dict order keeps discovery order.
+    unique = {}
     for label, path in candidates:
-        key = path.lower()
-        if key in seen:
-            continue
-        seen.add(key)
-        unique.append((label, path))
-    return unique
+        unique.setdefault(os.path.normcase(path), (label, path))
+    return list(unique.values())
+
+
+def dir_is_nonempty(path):
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is not None
+    except OSError:
+        return False
+
+
+def move_into(src, dst):
+    # Same-volume renames; existing folders are merged and existing files
+    # replaced, like the copy-based install used to do.
+    if os.path.isdir(dst) and not os.path.islink(dst) and os.path.isdir(src):
+        with os.scandir(src) as it:
+            for entry in it:
+                move_into(entry.path, os.path.join(dst, entry.name))
+    else:
+        os.replace(src, dst)
 
 
 def install_mod(zip_path, target_path, force=False):
@@ -959,25 +1868,26 @@ def install_mod(zip_path, target_path, force=False):
     if not os.path.isdir(target_path):
         print_error("Target install path is invalid.")
         return False
-    extracted_path = ""
+    staging = ""
     try:
         base_name = os.path.splitext(os.path.basename(zip_path))[0]
         existing_dir = os.path.join(target_path, base_name)
-        if os.path.isdir(existing_dir) and os.listdir(existing_dir) and not force:
+        if not force and dir_is_nonempty(existing_dir):
             print_info("Up to date — nothing to do.")
             return True
-        extracted_path = extract_mod(zip_path)
-        if not extracted_path:
+        # Extract next to the mods on the same volume, then rename entries
+        # into place, so a failed extraction never leaves partial files in
+        # the game folder and nothing is copied twice. ZipFile.extract still
+        # strips absolute paths and ".." components.
+        staging = tempfile.mkdtemp(prefix=".modiodirect_", dir=target_path)
+        print_status("Installing...")
+        if not extract_mod(zip_path, staging):
             print_error("Install skipped (extraction failed).")
             return False
-        print_status("Installing...")
-        for name in os.listdir(extracted_path):
-            src = os.path.join(extracted_path, name)
-            dst = os.path.join(target_path, name)
-            if os.path.isdir(src):
-                shutil.copytree(src, dst, dirs_exist_ok=True)
-            else:
-                shutil.copy2(src, dst)
+        with os.scandir(staging) as it:
+            names = [entry.name for entry in it]
+        for name in names:
+            move_into(os.path.join(staging, name), os.path.join(target_path, name))
         print_status("Install complete.")
         print_info(f"Mod installed successfully: {target_path}")
         return True
@@ -985,8 +1895,18 @@ def install_mod(zip_path, target_path, force=False):
         print_error("Unexpected error occurred.")
         return False
     finally:
-        if extracted_path and os.path.isdir(extracted_path):
-            shutil.rmtree(extracted_path, ignore_errors=True)
+        if staging:
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+def submit_lookup(func, *args):
+    # Shared by all batch workers. A caller only ever waits on work it
+    # submitted itself, so a busy pool just queues instead of deadlocking.
+    global _LOOKUP_POOL
+    with _LOOKUP_POOL_GUARD:
+        if _LOOKUP_POOL is None:
+            _LOOKUP_POOL = ThreadPoolExecutor(max_workers=LOOKUP_WORKERS, thread_name_prefix="modio-lookup")
+    return _LOOKUP_POOL.submit(run_prefixed, output_prefix(), func, *args)
 
 
 def process_single_mod(api_key, game_slug, mod_slug, install_requested, force_requested, cache):
@@ -998,7 +1918,11 @@ def process_single_mod(api_key, game_slug, mod_slug, install_requested, force_re
     if err:
         print_error(friendly_error(err))
         return False, None, "", None, None, False, False
-    game_details, gerr = fetch_game_details(api_key, game_id)
+    # The game details and the mod lookup only need game_id, so they run at
+    # the same time; likewise the mod details and its file list.
+    game_future = submit_lookup(fetch_game_details, api_key, game_id)
+    mod_id, err = resolve_mod_id(api_key, game_id, mod_slug)
+    game_details, gerr = game_future.result()
     if gerr:
         print_error(friendly_error(gerr))
         return False, None, "", game_id, None, False, False
@@ -1010,11 +1934,12 @@ def process_single_mod(api_key, game_slug, mod_slug, install_requested, force_re
     if game_name:
         print_info(f"Game : {game_name}")
 
-    mod_id, err = resolve_mod_id(api_key, game_id, mod_slug)
     if err:
         print_error(friendly_error(err))
         return False, None, game_name, game_id, None, False, False
+    files_future = submit_lookup(fetch_mod_files, api_key, game_id, mod_id)
     mod_details, merr = fetch_mod_details(api_key, game_id, mod_id)
+    files, err = files_future.result()
     if merr:
         print_error(friendly_error(merr))
         return False, None, game_name, game_id, None, False, False
@@ -1028,7 +1953,6 @@ def process_single_mod(api_key, game_slug, mod_slug, install_requested, force_re
     if mod_name:
         print_info(f"Mod  : {mod_name}")
 
-    files, err = fetch_mod_files(api_key, game_id, mod_id)
     if err:
         print_error(friendly_error(err))
         return False, None, game_name, game_id, None, False, False
@@ -1046,106 +1970,237 @@ def process_single_mod(api_key, game_slug, mod_slug, install_requested, force_re
     latest_version_id = latest_file.get("id") if isinstance(latest_file, dict) else None
     latest_version_number = latest_file.get("version") if isinstance(latest_file, dict) else None
     expected_size = get_expected_size(latest_file)
+    expected_hash = get_expected_hash(latest_file)
 
     print_info(f"Latest file: {filename}")
-    cache_mods = cache.get("mods", {}) if isinstance(cache, dict) else {}
-    entry = cache_mods.get(str(mod_id)) if isinstance(cache_mods, dict) else None
+    entry = get_cached_mod(cache, mod_id)
     existing_path = os.path.join(DOWNLOAD_DIR, filename) if filename else ""
+    # One stat answers both "is it there" and "is it complete" below.
+    try:
+        existing_st = os.stat(existing_path) if existing_path else None
+    except OSError:
+        existing_st = None
+    existing_is_file = existing_st is not None and stat.S_ISREG(existing_st.st_mode)
+
+    existing_ok = (
+        existing_is_file
+        and (expected_size is None or existing_st.st_size == expected_size)
+        and not force_requested
+    )
+    version_current = bool(entry) and entry.get("latest_version_id") == latest_version_id and not force_requested
 
     downloaded_path = None
     skipped = False
     install_skip = False
-    if entry and entry.get("latest_version_id") == latest_version_id and not force_requested:
-        if install_requested:
-            installed_id = entry.get("installed_version_id")
-            installed_path = entry.get("installed_path")
-            if installed_id == latest_version_id and isinstance(installed_path, str) and os.path.isdir(installed_path):
-                print_info("Up to date — nothing to do.")
-                install_skip = True
-                return True, "", game_name, game_id, mod_id, True, install_skip
-        if os.path.isfile(existing_path):
-            if expected_size is None or os.path.getsize(existing_path) == expected_size:
-                print_info("Already latest version. Skipping download.")
-                downloaded_path = existing_path
-                skipped = True
-
-    if downloaded_path is None:
-        if not install_requested and os.path.isfile(existing_path) and not force_requested:
-            if expected_size is None or os.path.getsize(existing_path) == expected_size:
-                print_info("Already downloaded. Using existing file.")
-                downloaded_path, skipped = existing_path, True
-        if downloaded_path is not None:
-            pass
-        if install_requested:
-            if os.path.isfile(existing_path) and (expected_size is None or os.path.getsize(existing_path) == expected_size) and not force_requested:
-                print_info(f"File already exists, skipping: {existing_path}")
-                downloaded_path, skipped = existing_path, True
-            else:
-                if filename:
-                    temp_dir = tempfile.mkdtemp(prefix="modiodirect_")
-                    temp_path = os.path.join(temp_dir, filename)
-                    result = download_mod(
-                        binary_url,
-                        temp_path,
-                        expected_size=expected_size,
-                        allow_existing=False,
-                    )
-                    if result:
-                        downloaded_path, skipped = result
+    if version_current and install_requested:
+        installed_id = entry.get("installed_version_id")
+        installed_path = entry.get("installed_path")
+        if installed_id == latest_version_id and isinstance(installed_path, str) and os.path.isdir(installed_path):
+            print_info("Up to date — nothing to do.")
+            install_skip = True
+            return True, "", game_name, game_id, mod_id, True, install_skip
+
+    if existing_ok:
+        if version_current:
+            print_info("Already latest version. Skipping download.")
+        elif install_requested:
+            print_info(f"File already exists, skipping: {existing_path}")
         else:
-            if downloaded_path is None:
-                result = download_mod(
-                    binary_url,
-                    filename,
-                    expected_size=expected_size,
-                    allow_existing=True,
-                )
-                if result is not None:
-                    downloaded_path, skipped = result
+            print_info("Already downloaded. Using existing file.")
+        downloaded_path, skipped = existing_path, True
+    elif install_requested:
+        if filename:
+            temp_dir = tempfile.mkdtemp(prefix="modiodirect_")
+            temp_path = os.path.join(temp_dir, filename)
+            result = download_mod(
+                binary_url,
+                temp_path,
+                expected_size=expected_size,
+                allow_existing=False,
+                expected_hash=expected_hash,
+            )
+            if result:
+                downloaded_path, skipped = result
+    else:
+        result = download_mod(
+            binary_url,
+            filename,
+            expected_size=expected_size,
+            allow_existing=True,
+            expected_hash=expected_hash,
+        )
+        if result is not None:
+            downloaded_path, skipped = result
 
     ok = downloaded_path is not None
     if ok:
+        now_iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
         if not skipped and not install_requested:
             if filename:
                 print_info(f"Saved as: {os.path.join(DOWNLOAD_DIR, filename)}")
         try:
-            os.makedirs(DOWNLOAD_DIR, exist_ok=True)
-            info_path = os.path.join(DOWNLOAD_DIR, "modinfo.json")
+            info_path = os.path.join(DOWNLOAD_DIR, f"modinfo-{mod_id}.json")
             info = {
                 "game_name": game_name,
                 "mod_name": mod_name,
                 "mod_id": mod_id,
                 "file_id": latest_version_id,
-                "date_downloaded": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "date_downloaded": now_iso,
             }
-            with open(info_path, "w", encoding="utf-8") as f:
-                json.dump(info, f, indent=2)
+            # One file per mod so batch jobs don't overwrite each other. A real
+            # download always records its date; when the download was skipped
+            # the file is left alone unless it is missing or out of date.
+            with _CACHE_LOCK:
+                previous = read_json_dict(info_path) if skipped else {}
+                previous["date_downloaded"] = now_iso
+                if previous != info:
+                    write_file_atomic(info_path, json_dumps(info))
         except Exception:
             print_error("Unexpected error occurred.")
-        if isinstance(cache, dict):
-            cache.setdefault("mods", {})
-            cache["mods"][str(mod_id)] = {
-                "mod_id": mod_id,
-                "mod_name": mod_name,
-                "latest_version_id": latest_version_id,
-                "latest_version_number": latest_version_number,
-                "file_name": filename,
-                "file_size": expected_size,
-                "download_date": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            }
-            save_cache(cache)
+        put_cached_mod(cache, mod_id, {
+            "mod_id": mod_id,
+            "mod_name": mod_name,
+            "latest_version_id": latest_version_id,
+            "latest_version_number": latest_version_number,
+            "file_name": filename,
+            "file_size": expected_size,
+            "download_date": now_iso,
+        })
         return True, downloaded_path, game_name, game_id, mod_id, skipped, install_skip
 
     print_error("Download failed after retry.")
     return False, None, game_name, game_id, mod_id, False, install_skip
 
 
-def main():
-    print_banner()
-    if not try_auto_install_requests():
-        print_error("Cannot continue without 'requests'.")
+def batch_prefix(game_slug, mod_slug):
+    return f"[{game_slug}/{mod_slug}] "
+
+
+def assign_bar_position(positions):
+    _OUTPUT.bar_position = next(positions)
+
+
+def process_batch_url(api_key, raw_url, game_slug, mod_slug, install_requested, force_requested, cache):
+    with prefixed_output(batch_prefix(game_slug, mod_slug)):
+        print_info(f"Processing: {raw_url}")
+        try:
+            return process_single_mod(api_key, game_slug, mod_slug, install_requested, force_requested, cache)
+        except Exception:
+            print_error("Unexpected error occurred.")
+            return False, None, "", None, None, False, False
+
+
+def run_batch(api_key, batch_path, install_requested, force_requested, cache, jobs=DEFAULT_JOBS, install_dir=None):
+    urls = load_batch_urls(batch_path)
+    if not urls:
+        print_error("Batch file is empty or unreadable.")
         return
+    print_info(f"Batch mode: {len(urls)} URL(s)")
+    pairs = []
+    failed = []
+    for raw_url in urls:
+        gs, ms = parse_modio_url(raw_url)
+        if not gs or not ms:
+            print_error(f"Invalid URL in batch file: {raw_url}")
+            failed.append(raw_url)
+            continue
+        pairs.append((raw_url, gs, ms))
+    batch_target = None
+    if install_requested and install_dir:
+        batch_target = resolve_install_dir(install_dir)
+        install_requested = batch_target is not None
+    elif install_requested and not stdin_is_interactive():
+        print_error("No terminal to choose an install folder; pass --install-dir. Install skipped.")
+        install_requested = False
+    elif install_requested:
+        if pairs:
+            _raw_url, gs, _ms = pairs[0]
+            gid, err = resolve_game_id(api_key, gs)
+            if err:
+                print_error(friendly_error(err))
+                install_requested = False
+            else:
+                gdetails, gerr = fetch_game_details(api_key, gid)
+                gname = ""
+                if not gerr and isinstance(gdetails, dict):
+                    name = gdetails.get("name")
+                    if isinstance(name, str):
+                        gname = name
+                candidates = detect_mod_folders(gname, gid)
+                if not candidates:
+                    print_error("Mod folder not found. Install skipped.")
+                    install_requested = False
+                else:
+                    print("Select install location:")
+                    for idx, (label, path) in enumerate(candidates, start=1):
+                        print(f"[{idx}] {label} -> {path}")
+                    print(f"[{len(candidates)+1}] Skip install")
+                    choice = input("Choose a number (or 'q' to cancel): ").strip()
+                    if choice.lower() in ("q", "quit", "exit", "back"):
+                        print_info("Install skipped.")
+                        install_requested = False
+                        batch_target = None
+                        choice = ""
+                    try:
+                        num = int(choice)
+                    except Exception:
+                        num = -1
+                    if num == len(candidates) + 1:
+                        print_info("Install skipped.")
+                        install_requested = False
+                    elif 1 <= num <= len(candidates):
+                        _label, target = candidates[num - 1]
+                        batch_target = target
+                    else:
+                        print_error("Invalid choice.")
+                        install_requested = False
+    global _DOWNLOAD_SLOTS
+    # --jobs is where the download limit starts; the limiter then moves it
+    # within 1..MAX_JOBS by measured throughput, so the pool is sized for the
+    # ceiling. --jobs 1 stays strictly sequential. No point starting more
+    # workers than there are mods to fetch.
+    jobs = max(1, min(MAX_JOBS, jobs))
+    workers = max(1, min(MAX_JOBS if jobs > 1 else 1, len(pairs)))
+    slots = None
+    if workers > 1:
+        slots = AdaptiveConcurrency(min(jobs, workers), maximum=workers)
+        slots.start()
+    _DOWNLOAD_SLOTS = slots
+    completed = 0
+    try:
+        # Sequential runs keep tqdm's default single bar.
+        positions = itertools.count() if workers > 1 else itertools.repeat(None)
+        with ThreadPoolExecutor(max_workers=workers, initializer=assign_bar_position, initargs=(positions,)) as ex:
+            futures = {
+                ex.submit(process_batch_url, api_key, raw_url, gs, ms, install_requested, force_requested, cache): (raw_url, gs, ms)
+                for raw_url, gs, ms in pairs
+            }
+            for future in as_completed(futures):
+                raw_url, gs, ms = futures[future]
+                ok, downloaded_path, _game_name, _game_id, mod_id, _skipped, install_skip = future.result()
+                # Installs share one target folder, so they stay on this thread.
+                if ok and install_requested and batch_target and not install_skip:
+                    with prefixed_output(batch_prefix(gs, ms)):
+                        if install_mod(downloaded_path, batch_target, force=force_requested):
+                            record_install(cache, mod_id, batch_target)
+                    cleanup_temp_file(downloaded_path)
+                if ok:
+                    completed += 1
+                else:
+                    failed.append(raw_url)
+    finally:
+        _DOWNLOAD_SLOTS = None
+        if slots is not None:
+            slots.stop()
+    print_info(f"Batch complete: {completed}/{len(urls)} successful.")
+    # Listed in file order, not completion order.
+    order = {raw_url: idx for idx, raw_url in enumerate(urls)}
+    for raw_url in sorted(failed, key=order.get):
+        print_error(f"Failed: {raw_url}")
 
+
+def main():
+    print_banner()
     parser = argparse.ArgumentParser(
         description="ModioDirect - crash-proof mod.io downloader",
         epilog=(
@@ -1153,29 +2208,50 @@ def main():
             "  python ModioDirect.py https://mod.io/g/spaceengineers/m/assault-weapons-pack1\n"
             "  python ModioDirect.py https://mod.io/g/spaceengineers/m/assault-weapons-pack1 --install\n"
             "  python ModioDirect.py --no-config\n"
+            "  python ModioDirect.py --batch mods.txt --jobs 8\n"
             "Tip: Paste a URL at the prompt, or type file:C:\\path\\to\\mods.txt for batch."
         ),
         formatter_class=argparse.RawTextHelpFormatter,
     )
     parser.add_argument("mod_url", nargs="?", help="mod.io mod URL")
+    parser.add_argument("--batch", metavar="FILE", help="Download every mod URL listed in FILE (one per line)")
     parser.add_argument("--install", action="store_true", help="Install mod to detected game folder (opt-in)")
+    parser.add_argument("--install-dir", metavar="DIR", help="Install into DIR instead of choosing a detected folder (implies --install)")
     parser.add_argument("--no-config", action="store_true", help="Do not save API key to config.json")
     parser.add_argument("--no-pause", action="store_true", help="Do not pause on exit")
     parser.add_argument("--debug", action="store_true", help="Show technical errors")
     parser.add_argument("--force", action="store_true", help="Reinstall regardless of version")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached API lookups and fetch fresh data")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help=f"Parallel downloads to start with in batch mode; adjusted within 1-{MAX_JOBS} by throughput, 1 = one at a time (default {DEFAULT_JOBS})")
     args, _unknown = parser.parse_known_args()
-    global DEBUG
+    # Arguments are parsed before requests is imported or auto-installed, so
+    # --help returns immediately.
+    if not try_auto_install_requests():
+        print_error("Cannot continue without 'requests'.")
+        return
+    install_flag = args.install or bool(args.install_dir)
+    global DEBUG, USE_CACHE
     DEBUG = args.debug
+    USE_CACHE = not args.no_cache
+    if not USE_CACHE:
+        for func in (resolve_game_id, fallback_search_game_id, resolve_mod_id, fetch_game_details):
+            func.cache_clear()
 
-    config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), CONFIG_NAME)
+    config_path = os.path.join(APP_DIR, CONFIG_NAME)
     use_config = not args.no_config
     api_key = prompt_api_key(config_path, use_config)
     cache = load_cache()
+    global _HTTP_CACHE
+    _HTTP_CACHE = cache if USE_CACHE else None
+
+    if args.batch:
+        run_batch(api_key, args.batch, install_flag, args.force, cache, jobs=args.jobs, install_dir=args.install_dir)
+        return
 
     while True:
         if args.mod_url:
             game_slug, mod_slug = parse_modio_url(args.mod_url)
-            install_requested = args.install
+            install_requested = install_flag
             force_requested = args.force
             if not game_slug or not mod_slug:
                 print_error("Invalid mod URL.")
@@ -1187,84 +2263,18 @@ def main():
             print_info("Check GitHub for more: https://github.com/Therootexec/ModioDirect")
             return
         if game_slug == "BATCH_FILE":
-            urls = load_batch_urls(mod_slug)
-            if not urls:
-                print_error("Batch file is empty or unreadable.")
-                continue
-            print_info(f"Batch mode: {len(urls)} URL(s)")
-            batch_target = None
-            if install_requested:
-                first_valid = None
-                for raw_url in urls:
-                    gs, ms = parse_modio_url(raw_url)
-                    if gs and ms:
-                        first_valid = (gs, ms)
-                        break
-                if first_valid:
-                    gs, ms = first_valid
-                    gid, err = resolve_game_id(api_key, gs)
-                    if err:
-                        print_error(friendly_error(err))
-                        install_requested = False
-                    else:
-                        gdetails, gerr = fetch_game_details(api_key, gid)
-                        gname = ""
-                        if not gerr and isinstance(gdetails, dict):
-                            name = gdetails.get("name")
-                            if isinstance(name, str):
-                                gname = name
-                        candidates = detect_mod_folders(gname, gid)
-                        if not candidates:
-                            print_error("Mod folder not found. Install skipped.")
-                            install_requested = False
-                        else:
-                            print("Select install location:")
-                            for idx, (label, path) in enumerate(candidates, start=1):
-                                print(f"[{idx}] {label} -> {path}")
-                            print(f"[{len(candidates)+1}] Skip install")
-                            choice = input("Choose a number (or 'q' to cancel): ").strip()
-                            if choice.lower() in ("q", "quit", "exit", "back"):
-                                print_info("Install skipped.")
-                                install_requested = False
-                                batch_target = None
-                                choice = ""
-                            try:
-                                num = int(choice)
-                            except Exception:
-                                num = -1
-                            if num == len(candidates) + 1:
-                                print_info("Install skipped.")
-                                install_requested = False
-                            elif 1 <= num <= len(candidates):
-                                _label, target = candidates[num - 1]
-                                batch_target = target
-                            else:
-                                print_error("Invalid choice.")
-                                install_requested = False
-            completed = 0
-            for raw_url in urls:
-                gs, ms = parse_modio_url(raw_url)
-                if not gs or not ms:
-                    print_error(f"Invalid URL in batch file: {raw_url}")
-                    continue
-                print_info(f"Processing: {raw_url}")
-                ok, downloaded_path, game_name, game_id, mod_id, _skipped, install_skip = process_single_mod(api_key, gs, ms, install_requested, force_requested, cache)
-                if ok and install_requested and batch_target and not install_skip:
-                    if install_mod(downloaded_path, batch_target, force=force_requested):
-                        if isinstance(cache, dict) and mod_id is not None:
-                            cache.setdefault("mods", {})
-                            entry = cache["mods"].get(str(mod_id), {})
-                            entry["installed_version_id"] = entry.get("latest_version_id")
-                            entry["installed_path"] = batch_target
-                            cache["mods"][str(mod_id)] = entry
-                            save_cache(cache)
-                    cleanup_temp_file(downloaded_path)
-                if ok:
-                    completed += 1
-            print_info(f"Batch complete: {completed}/{len(urls)} successful.")
+            run_batch(api_key, mod_slug, install_requested, force_requested, cache, jobs=args.jobs, install_dir=args.install_dir)
         else:
             ok, downloaded_path, game_name, game_id, mod_id, _skipped, install_skip = process_single_mod(api_key, game_slug, mod_slug, install_requested, force_requested, cache)
-            if ok and install_requested and not install_skip:
+            if ok and install_requested and not install_skip and args.install_dir:
+                target = resolve_install_dir(args.install_dir)
+                if target:
+                    if install_mod(downloaded_path, target, force=force_requested):
+                        record_install(cache, mod_id, target)
+                    cleanup_temp_file(downloaded_path)
+            elif ok and install_requested and not install_skip and not stdin_is_interactive():
+                print_error("No terminal to choose an install folder; pass --install-dir. Install skipped.")
+            elif ok and install_requested and not install_skip:
                 candidates = detect_mod_folders(game_name, game_id)
                 if not candidates:
                     print_error("Mod folder not found. Install skipped.")
@@ -1286,13 +2296,7 @@ def main():
                     elif 1 <= num <= len(candidates):
                         _label, target = candidates[num - 1]
                         if install_mod(downloaded_path, target, force=force_requested):
-                            if isinstance(cache, dict) and mod_id is not None:
-                                cache.setdefault("mods", {})
-                                entry = cache["mods"].get(str(mod_id), {})
-                                entry["installed_version_id"] = entry.get("latest_version_id")
-                                entry["installed_path"] = target
-                                cache["mods"][str(mod_id)] = entry
-                                save_cache(cache)
+                            record_install(cache, mod_id, target)
                         cleanup_temp_file(downloaded_path)
                     else:
                         print_error("Invalid choice.")